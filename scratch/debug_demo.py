@@ -1,7 +1,6 @@
 def calc_total(prices: list[int], discount_pct: int) -> int:
-    # BUG: тут специально сделана логическая ошибка
-    discounted = [p * (100 - discount_pct) / 100 for p in prices]  # должно быть /100
-    return sum(discounted)
+    # скидка одна на все позиции: sum(p * k) == sum(p) * k, считаем в целых
+    return sum(prices) * (100 - discount_pct) // 100
 
 
 def main():
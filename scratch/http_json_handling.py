@@ -1,34 +1,56 @@
 from __future__ import annotations
 
+import atexit
 from typing import Any
 
 import httpx
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson не установлен
+    from json import loads as _json_loads
+
 
 class BadAPIResponse(RuntimeError):
     """Ответ API не соответствует ожиданиям (не JSON или неправильная структура)."""
 
 
-def fetch_json(url: str) -> dict[str, Any]:
-    timeout = httpx.Timeout(connect=3.0, read=10.0, write=10.0, pool=3.0)
+TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=10.0, pool=3.0)
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+_CLIENT: httpx.Client | None = None
+
 
-    with httpx.Client(timeout=timeout) as client:
-        r = client.get(url)
-        r.raise_for_status()
+def _client() -> httpx.Client:
+    """Один клиент на процесс: keep-alive соединения переиспользуются между вызовами."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            timeout=TIMEOUT,
+            limits=LIMITS,
+        )
+        atexit.register(_CLIENT.close)
+    return _CLIENT
 
-        # 1) Пробуем JSON
-        try:
-            data = r.json()
-        except ValueError as e:
-            # Показываем кусочек тела, чтобы было видно, что пришло (например HTML)
-            snippet = (r.text or "")[:200].replace("\n", " ")
-            raise BadAPIResponse(f"Expected JSON but got non-JSON. Snippet: {snippet}") from e
 
-        # 2) Проверяем тип
-        if not isinstance(data, dict):
-            raise BadAPIResponse(f"Expected dict JSON, got {type(data).__name__}")
+def fetch_json(url: str) -> dict[str, Any]:
+    client = _client()
+    r = client.get(url)
+    r.raise_for_status()
+
+    # 1) Пробуем JSON
+    try:
+        data = _json_loads(r.content)
+    except ValueError as e:
+        # Показываем кусочек тела, чтобы было видно, что пришло (например HTML)
+        snippet = (r.text or "")[:200].replace("\n", " ")
+        raise BadAPIResponse(f"Expected JSON but got non-JSON. Snippet: {snippet}") from e
+
+    # 2) Проверяем тип
+    if not isinstance(data, dict):
+        raise BadAPIResponse(f"Expected dict JSON, got {type(data).__name__}")
 
-        return data
+    return data
 
 
 def main() -> None:
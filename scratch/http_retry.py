@@ -1,46 +1,164 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import importlib.util
+import random
 import time
 from typing import Any
 
 import httpx
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson не установлен
+    from json import loads as _json_loads
+
+MAX_BACKOFF = 10.0  # потолок паузы между попытками, сек
+MAX_RETRY_AFTER = 60.0  # больше Retry-After сервера не ждем, сек
+RETRYABLE_STATUS = (429, 503)  # плюс любой 5xx
+
+# HTTP/2 в httpx требует extra httpx[http2] (пакет h2); без него остаемся на HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=10.0, pool=3.0)
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+_CLIENT: httpx.Client | None = None
+
+
+def _client() -> httpx.Client:
+    """Один клиент на процесс: keep-alive соединения переиспользуются между вызовами."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            timeout=TIMEOUT,
+            limits=LIMITS,
+        )
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
 
 def get_json_with_retries(url: str, *, attempts: int = 4) -> dict[str, Any]:
-    timeout = httpx.Timeout(connect=3.0, read=10.0, write=10.0, pool=3.0)
+    """GET с повторами. Повторяем только GET: он идемпотентен, дубль запроса безопасен."""
+    client = _client()
 
     last_exc: Exception | None = None
-    with httpx.Client(timeout=timeout) as client:
-        for i in range(1, attempts + 1):
-            try:
-                r = client.get(url)
-                # 1) HTTP ошибки
-                if r.status_code >= 500:
-                    # серверная ошибка — можно повторить
-                    raise httpx.HTTPStatusError(
-                        f"Server error {r.status_code}",
-                        request=r.request,
-                        response=r,
-                    )
-                r.raise_for_status()
-
-                # 2) Парсим JSON
-                return r.json()
+    for i in range(1, attempts + 1):
+        try:
+            r = client.get(url)
+            _check_status(r)
+            return _json_loads(r.content)
 
-            except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as e:
-                last_exc = e
-                # backoff: 0.5, 1.0, 2.0, ...
-                sleep_s = 0.5 * (2 ** (i - 1))
-                print(f"Attempt {i}/{attempts} failed: {type(e).__name__}. Sleep {sleep_s:.1f}s")
-                if i < attempts:
-                    time.sleep(sleep_s)
-                else:
-                    break
+        except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as e:
+            if not _is_retryable(e):
+                raise
+            last_exc = e
+            sleep_s = _backoff_seconds(i, e)
+            print(f"Attempt {i}/{attempts} failed: {type(e).__name__}. Sleep {sleep_s:.1f}s")
+            if i < attempts:
+                time.sleep(sleep_s)
+            else:
+                break
 
     assert last_exc is not None
     raise last_exc
 
 
+async def get_json_with_retries_async(
+    urls: list[str], *, attempts: int = 4
+) -> list[dict[str, Any]]:
+    """
+    Несколько GET параллельно через один AsyncClient (по HTTP/2 — одно TLS-соединение
+    на хост с мультиплексированием). Повторы/backoff те же, что в get_json_with_retries.
+    Результаты в порядке urls; первая окончательная ошибка пробрасывается,
+    остальные запросы при этом отменяются (TaskGroup) до закрытия клиента.
+    """
+    async with httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=TIMEOUT,
+        limits=LIMITS,
+    ) as client:
+
+        async def fetch_one(url: str) -> dict[str, Any]:
+            last_exc: Exception | None = None
+            for i in range(1, attempts + 1):
+                try:
+                    r = await client.get(url)
+                    _check_status(r)
+                    return _json_loads(r.content)
+
+                except (
+                    httpx.TimeoutException,
+                    httpx.TransportError,
+                    httpx.HTTPStatusError,
+                ) as e:
+                    if not _is_retryable(e):
+                        raise
+                    last_exc = e
+                    sleep_s = _backoff_seconds(i, e)
+                    print(
+                        f"{url}: attempt {i}/{attempts} failed: {type(e).__name__}. "
+                        f"Sleep {sleep_s:.1f}s"
+                    )
+                    if i < attempts:
+                        await asyncio.sleep(sleep_s)
+
+            assert last_exc is not None
+            raise last_exc
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(fetch_one(u)) for u in urls]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from None  # как у sync-версии: одно исключение httpx
+
+        return [t.result() for t in tasks]
+
+
+def _check_status(r: httpx.Response) -> None:
+    # серверная ошибка или rate limit — можно повторить
+    if r.status_code >= 500 or r.status_code in RETRYABLE_STATUS:
+        raise httpx.HTTPStatusError(
+            f"Retryable {r.status_code}",
+            request=r.request,
+            response=r,
+        )
+    r.raise_for_status()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Сеть/таймаут, 5xx и 429 повторяем; прочие 4xx — нет, повтор ничего не изменит."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code >= 500 or code in RETRYABLE_STATUS
+    return True
+
+
+def _backoff_seconds(attempt: int, exc: Exception) -> float:
+    # backoff: 0.5, 1.0, 2.0, ... с jitter ±50%, чтобы параллельные клиенты
+    # не повторяли запросы синхронно; потолок MAX_BACKOFF — уже после jitter
+    sleep_s = min(MAX_BACKOFF, 0.5 * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+    resp = exc.response if isinstance(exc, httpx.HTTPStatusError) else None
+    if resp is not None and resp.status_code in RETRYABLE_STATUS:
+        retry_after = _retry_after_seconds(resp)
+        if retry_after is not None:
+            # Retry-After соблюдаем, но не дольше MAX_RETRY_AFTER (86400 — не повод висеть сутки)
+            sleep_s = max(sleep_s, min(retry_after, MAX_RETRY_AFTER))
+    return sleep_s
+
+
+def _retry_after_seconds(r: httpx.Response) -> float | None:
+    """Retry-After в секундах (форму с HTTP-датой не поддерживаем)."""
+    ra = r.headers.get("Retry-After")
+    if ra is None:
+        return None
+    try:
+        return max(0.0, float(ra))
+    except ValueError:
+        return None
+
+
 def main() -> None:
     data = get_json_with_retries("https://api.github.com")
     print("ok keys:", list(data.keys())[:5])
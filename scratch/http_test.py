@@ -1,13 +1,31 @@
+import atexit
+
 import httpx
 
+TIMEOUT = httpx.Timeout(10.0)
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+_CLIENT: httpx.Client | None = None
+
+
+def _client() -> httpx.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            timeout=TIMEOUT,
+            limits=LIMITS,
+        )
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
 
 def main() -> None:
-    with httpx.Client(timeout=10.0) as client:
-        r = client.get("https://api.github.com")
-        r.raise_for_status()
-        data = r.json()
-        print("status:", r.status_code)
-        print("keys:", list(data.keys())[:5])
+    client = _client()
+    r = client.get("https://api.github.com")
+    r.raise_for_status()
+    data = r.json()
+    print("status:", r.status_code)
+    print("keys:", list(data.keys())[:5])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+# src/tg_nhl_agent/_scoring_numba.py
+"""
+Опциональное JIT-ядро скоринга (numba).
+
+Та же арифметика и тот же порядок сложений, что в usecase._score_kernel_py,
+но над numpy-массивами. numba не объявлена в зависимостях проекта — ставится
+отдельно (pip install numba) для прогонов на больших батчах.
+
+numba/numpy импортируются и ядро компилируется лениво, при первом вызове
+score_kernel: импорт usecase не платит за numba (~0.4s) даже если она стоит.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# Дешевая проверка без импорта самого пакета
+NUMBA_AVAILABLE = find_spec("numba") is not None
+
+
+@lru_cache(maxsize=1)
+def _compiled() -> Optional[Tuple[Callable[..., Any], Any]]:
+    """(njit-ядро, numpy) или None, если numba не импортируется."""
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def _score_kernel(
+        home_w,
+        away_w,
+        offsets,
+        row_w,
+        goals,
+        assists,
+        went_ot,
+        went_so,
+        score_home,
+        score_away,
+    ):
+        n = home_w.shape[0]
+        scores = np.zeros(n)
+        row_delta = np.zeros(row_w.shape[0])
+        tg_bonus = np.zeros(n)
+
+        for i in range(n):
+            score = home_w[i] + away_w[i]
+
+            for j in range(offsets[i], offsets[i + 1]):
+                d = row_w[j] * (float(goals[j]) + 0.5 * float(assists[j]))
+                row_delta[j] = d
+                score += d
+
+            if went_ot[i]:
+                score += 0.2
+            if went_so[i]:
+                score += 0.2
+            tg = min(1.0, (score_home[i] + score_away[i]) / 10.0) * 0.2
+            tg_bonus[i] = tg
+            scores[i] = score + tg
+
+        return scores, row_delta, tg_bonus
+
+    return _score_kernel, np
+
+
+def score_kernel(
+    home_w: Sequence[float],
+    away_w: Sequence[float],
+    offsets: Sequence[int],
+    row_w: Sequence[float],
+    goals: Sequence[int],
+    assists: Sequence[int],
+    went_ot: Sequence[int],
+    went_so: Sequence[int],
+    score_home: Sequence[int],
+    score_away: Sequence[int],
+) -> Optional[Tuple[List[float], List[float], List[float]]]:
+    """
+    Обертка над njit-ядром: списки/array.array -> numpy и обратно в списки.
+    None — numba недоступна (вызывающий считает на чистом Python).
+    """
+    compiled = _compiled()
+    if compiled is None:
+        return None
+    kernel, np = compiled
+
+    scores, row_delta, tg_bonus = kernel(
+        np.asarray(home_w, dtype=np.float64),
+        np.asarray(away_w, dtype=np.float64),
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(row_w, dtype=np.float64),
+        np.asarray(goals, dtype=np.int64),
+        np.asarray(assists, dtype=np.int64),
+        np.asarray(went_ot, dtype=np.int8),
+        np.asarray(went_so, dtype=np.int8),
+        np.asarray(score_home, dtype=np.int64),
+        np.asarray(score_away, dtype=np.int64),
+    )
+    return scores.tolist(), row_delta.tolist(), tg_bonus.tolist()
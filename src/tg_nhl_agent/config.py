@@ -1,42 +1,118 @@
 from __future__ import annotations
 
+import json
 import os
+from contextlib import suppress
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
-
-import yaml
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Any, Mapping
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]  # .../tg-nhl-agent
 ENV_PATH = PROJECT_ROOT / ".env"
 CONFIG_PATH = PROJECT_ROOT / "config.yaml"
+CONFIG_CACHE_PATH = CONFIG_PATH.with_suffix(".yaml.json")  # распарсенный config.yaml
+
+# Переменные окружения, которые читает Settings
+ENV_KEYS = ("TELEGRAM_BOT_TOKEN", "TELEGRAM_CHANNEL_ID", "VK_API_TOKEN", "OPENAI_API_KEY")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     telegram_bot_token: str | None
     telegram_channel_id: str | None
     vk_api_token: str | None
     openai_api_key: str | None
-    config: dict[str, Any]
+    config: Mapping[str, Any]  # read-only целиком (см. _freeze): экземпляр общий (lru_cache)
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    # 1) Загружаем .env (если файл есть)
-    if ENV_PATH.exists():
+    """Настройки процесса; читаются один раз, дальше отдаются из кэша."""
+    # 1) Загружаем .env (если файл есть и окружение еще не заполнено целиком)
+    env = os.environ
+    if ENV_PATH.exists() and not all(k in env for k in ENV_KEYS):
+        from dotenv import load_dotenv  # импорт только если .env реально есть
+
         load_dotenv(ENV_PATH)
 
     # 2) Читаем config.yaml (если есть)
     if CONFIG_PATH.exists():
-        config_data = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8")) or {}
+        config_data = _load_config_data()
     else:
         config_data = {}
 
     return Settings(
-        telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN"),
-        telegram_channel_id=os.getenv("TELEGRAM_CHANNEL_ID"),
-        vk_api_token=os.getenv("VK_API_TOKEN"),
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
-        config=config_data,
+        telegram_bot_token=env.get("TELEGRAM_BOT_TOKEN"),
+        telegram_channel_id=env.get("TELEGRAM_CHANNEL_ID"),
+        vk_api_token=env.get("VK_API_TOKEN"),
+        openai_api_key=env.get("OPENAI_API_KEY"),
+        config=_freeze(config_data),
     )
+
+
+def _freeze(value: Any) -> Any:
+    """dict -> MappingProxyType, list -> tuple (рекурсивно): вложенные значения тоже не изменить."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def reload_settings() -> Settings:
+    """Сбросить кэш load_settings() и перечитать .env/config.yaml (для тестов)."""
+    load_settings.cache_clear()
+    return load_settings()
+
+
+def _load_config_data() -> dict[str, Any]:
+    """config.yaml -> dict; JSON-кэш рядом с yaml, пока он не старше самого yaml."""
+    cached = _read_config_cache()
+    if cached is not None:
+        return cached
+
+    # yaml импортируем только при промахе кэша: это заметная часть времени старта
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:  # PyYAML собран без libyaml
+        from yaml import SafeLoader as Loader  # type: ignore[assignment]
+
+    config_data: dict[str, Any] = yaml.load(CONFIG_PATH.read_bytes(), Loader=Loader) or {}
+    _write_config_cache(config_data)
+    return config_data
+
+
+def _read_config_cache() -> dict[str, Any] | None:
+    """Содержимое JSON-кэша или None, если кэша нет, он устарел или битый."""
+    cache = CONFIG_CACHE_PATH
+    try:
+        if cache.stat().st_mtime < CONFIG_PATH.stat().st_mtime:
+            return None
+        cached: dict[str, Any] = json.loads(cache.read_bytes())
+    except (OSError, ValueError):  # нет файла / недописан / не JSON — считаем промахом
+        return None
+    return cached
+
+
+def _write_config_cache(config_data: dict[str, Any]) -> None:
+    """Пишет кэш атомарно (tmp + os.replace); не-JSON-совместимый конфиг не кэшируем."""
+    try:
+        dumped = json.dumps(config_data, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return  # даты и т.п. в yaml: работаем без кэша
+    if json.loads(dumped) != config_data:
+        return  # round-trip с потерями (например, int-ключи -> str): кэш изменил бы конфиг
+
+    cache = CONFIG_CACHE_PATH
+    # свой tmp на процесс: параллельные воркеры не пишут в один файл
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(dumped, encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError:  # read-only FS и т.п.: просто работаем без кэша
+        with suppress(OSError):
+            tmp.unlink(missing_ok=True)
@@ -5,22 +5,23 @@
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from enum import Enum
-from typing import Dict, List, Optional
+from enum import StrEnum
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # -----------------------------
 # Общие enum'ы и базовые типы
 # -----------------------------
 
 
-class Severity(str, Enum):
+class Severity(StrEnum):
     WARNING = "warning"
     ERROR = "error"
 
 
-class SourceSystem(str, Enum):
+class SourceSystem(StrEnum):
     NHL = "nhl"
     VK = "vk"
     TG = "tg"
@@ -28,18 +29,18 @@ class SourceSystem(str, Enum):
     CORE = "core"
 
 
-class VideoKind(str, Enum):
+class VideoKind(StrEnum):
     HIGHLIGHTS = "highlights"
     FULL = "full"
 
 
-class VideoStatus(str, Enum):
+class VideoStatus(StrEnum):
     FOUND = "found"
     NOT_FOUND = "not_found"
     ERROR = "error"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AppError:
     """Единый формат ошибки/предупреждения для пайплайна и поста."""
 
@@ -49,8 +50,15 @@ class AppError:
     message: str  # коротко, по делу
     details: Optional[Dict[str, str]] = None  # для логов/диагностики (опционально)
 
+    # ключ дедупликации (code, source, message); считается один раз при создании
+    dedupe_key: Tuple[str, str, str] = field(init=False, repr=False, compare=False)
 
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        # cached_property несовместим со slots=True, поэтому кладем в поле
+        object.__setattr__(self, "dedupe_key", (self.code, self.source.value, self.message))
+
+
+@dataclass(frozen=True, slots=True)
 class Team:
     """Ссылка на команду."""
 
@@ -58,13 +66,19 @@ class Team:
     name: str  # "Boston Bruins"
     abbr: Optional[str] = None  # "BOS"
 
+    # подпись в посте: abbr, иначе name; считается один раз при создании
+    display: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "display", self.abbr or self.name)
+
 
 # -----------------------------
 # Контракты "для расчета" (могут содержать спойлеры)
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchForScoring:
     match_id: int
     start_time_utc: datetime
@@ -80,7 +94,35 @@ class MatchForScoring:
     went_shootout: Optional[bool] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class MatchBatch:
+    """
+    Те же MatchForScoring, но "по колонкам" (SoA): по плотному массиву на поле.
+    Строится один раз на батч, чтобы скоринг шел проходом по массивам,
+    а не по объектам матчей. None в счете/флагах -> 0.
+    """
+
+    match_ids: Tuple[int, ...]
+    score_home: array[int]  # "l"
+    score_away: array[int]  # "l"
+    went_overtime: array[int]  # "b", 0/1
+    went_shootout: array[int]  # "b", 0/1
+
+    @classmethod
+    def from_matches(cls, matches: List[MatchForScoring]) -> MatchBatch:
+        return cls(
+            match_ids=tuple(m.match_id for m in matches),
+            score_home=array("l", (m.score_home or 0 for m in matches)),
+            score_away=array("l", (m.score_away or 0 for m in matches)),
+            went_overtime=array("b", (bool(m.went_overtime) for m in matches)),
+            went_shootout=array("b", (bool(m.went_shootout) for m in matches)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+
+@dataclass(frozen=True, slots=True)
 class PlayerGameStats:
     """
     Агрегированные статы игрока за матч (без таймлайна событий).
@@ -95,7 +137,7 @@ class PlayerGameStats:
     assists: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScoringRule:
     """
     Таблица "повышающих очков".
@@ -110,7 +152,7 @@ class ScoringRule:
     label: Optional[str] = None  # человекочитаемая подпись (для дебага)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FavoritePlayer:
     """
     Игрок, за которым следим (для бонусов в ранжировании).
@@ -123,7 +165,7 @@ class FavoritePlayer:
     label: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScoreContribution:
     """
     Вклад конкретного правила/фактора в итоговый индекс.
@@ -136,16 +178,16 @@ class ScoreContribution:
     entity_id: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchScore:
     """Индекс интересности матча + (опционально) разложение на вклады."""
 
     match_id: int
     score: float
-    contributions: List[ScoreContribution] = field(default_factory=list)
+    contributions: Sequence[ScoreContribution] = ()  # пусто, если разложение не запрашивали
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RankedMatch:
     """Матч + его рейтинг (после скоринга/ранжирования)."""
 
@@ -158,7 +200,7 @@ class RankedMatch:
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VideoLinkResult:
     """
     Результат поиска/получения видео для матча и типа ролика.
@@ -180,7 +222,7 @@ class VideoLinkResult:
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PostItemPublic:
     """
     Одна строка/блок в посте.
@@ -198,7 +240,7 @@ class PostItemPublic:
     rank_score: Optional[float] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PostPublic:
     """
     То, что публикуем (или могли бы опубликовать).
@@ -216,7 +258,7 @@ class PostPublic:
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PublicationRecord:
     """
     Запись о том, что пост за конкретную дату был опубликован.
@@ -227,3 +269,24 @@ class PublicationRecord:
     published: bool
     tg_message_id: Optional[str] = None
     published_at_utc: Optional[datetime] = None
+
+
+# -----------------------------
+# Короткие алиасы enum-значений (LOAD_GLOBAL вместо обращения через класс enum)
+# -----------------------------
+
+SEV_WARNING = Severity.WARNING
+SEV_ERROR = Severity.ERROR
+
+SRC_NHL = SourceSystem.NHL
+SRC_VK = SourceSystem.VK
+SRC_TG = SourceSystem.TG
+SRC_STORAGE = SourceSystem.STORAGE
+SRC_CORE = SourceSystem.CORE
+
+VIDEO_HIGHLIGHTS = VideoKind.HIGHLIGHTS
+VIDEO_FULL = VideoKind.FULL
+
+VIDEO_FOUND = VideoStatus.FOUND
+VIDEO_NOT_FOUND = VideoStatus.NOT_FOUND
+VIDEO_ERROR = VideoStatus.ERROR
@@ -1,18 +1,51 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUP_COUNT = 5
+
 
 def setup_logging(level: str = "INFO", log_file: Path | None = None) -> None:
+    """
+    Вызывающий код только кладет запись в очередь (QueueHandler);
+    форматирование и запись в stderr/файл делает фоновый QueueListener.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
     handlers: list[logging.Handler] = [logging.StreamHandler()]
 
     if log_file is not None:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        # delay=True: файл открывается только при первой записи
+        handlers.append(
+            RotatingFileHandler(
+                log_file,
+                maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUP_COUNT,
+                encoding="utf-8",
+                delay=True,
+            )
+        )
+
+    for h in handlers:
+        h.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Полный формат применяют реальные handlers; здесь только текст сообщения,
+    # иначе basicConfig навесит свой формат и префикс задублируется.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
     logging.basicConfig(
         level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        handlers=handlers,
+        handlers=[queue_handler],
     )
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
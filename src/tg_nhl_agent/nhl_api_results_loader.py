@@ -18,7 +18,7 @@ from tg_nhl_agent.contracts import (
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoaderResult:
     matches: List[MatchForScoring]
     player_stats: List[PlayerGameStats]
@@ -6,4 +6,4 @@ def mask_secret(value: str | None, keep_last: int = 4) -> str:
         return "<empty>"
     if len(value) <= keep_last:
         return "<masked>"
-    return "<masked>..." + value[-keep_last:]
+    return f"<masked>...{value[-keep_last:]}"
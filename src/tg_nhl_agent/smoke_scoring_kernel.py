@@ -0,0 +1,64 @@
+# src/tg_nhl_agent/smoke_scoring_kernel.py
+from __future__ import annotations
+
+import random
+import sys
+from typing import List, Tuple
+
+from tg_nhl_agent._scoring_numba import NUMBA_AVAILABLE, score_kernel
+from tg_nhl_agent.usecase import _score_kernel_py
+
+Columns = Tuple[
+    List[float],
+    List[float],
+    List[int],
+    List[float],
+    List[int],
+    List[int],
+    List[int],
+    List[int],
+    List[int],
+    List[int],
+]
+
+
+def _random_columns(rnd: random.Random, n: int) -> Columns:
+    """Случайный батч в CSR-виде, как его собирает usecase.score_matches."""
+    offsets = [0]
+    for _ in range(n):
+        offsets.append(offsets[-1] + rnd.randint(0, 6))
+    rows = offsets[-1]
+    return (
+        [rnd.choice([0.0, 0.5, 1.5, rnd.random()]) for _ in range(n)],
+        [rnd.choice([0.0, 0.5, 1.5, rnd.random()]) for _ in range(n)],
+        offsets,
+        [rnd.choice([0.5, 2.0, rnd.random() * 3]) for _ in range(rows)],
+        [rnd.randint(0, 3) for _ in range(rows)],
+        [rnd.randint(0, 3) for _ in range(rows)],
+        [rnd.randint(0, 1) for _ in range(n)],
+        [rnd.randint(0, 1) for _ in range(n)],
+        [rnd.randint(0, 8) for _ in range(n)],
+        [rnd.randint(0, 8) for _ in range(n)],
+    )
+
+
+def main() -> None:
+    """Формула скоринга живет в двух копиях: njit-ядро должно совпадать с Python побитно."""
+    if not NUMBA_AVAILABLE:
+        print("numba not installed: nothing to compare")
+        return
+
+    rnd = random.Random(0)
+    for case in range(200):
+        cols = _random_columns(rnd, rnd.choice([0, 1, 15, 100, 600]))
+        got = score_kernel(*cols)
+        if got is None:
+            sys.exit("numba found but failed to import")
+        if got != _score_kernel_py(*cols):
+            sys.exit(f"kernel mismatch in case {case} (n={len(cols[0])})")
+
+    print("numba kernel == _score_kernel_py: 200 cases OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,16 @@
 # src/tg_nhl_agent/usecase.py
 """
-MVP v1: NHL rewatch recommender WITHOUT VK links.
+MVP v1: NHL rewatch recommender (VK-ссылки — опционально).
 
 Содержит:
 - Порты (Protocol) для адаптеров:
   - results_loader (матчи + статы игроков)
   - rules_loader (таблица весов/интереса)
+  - video_loader (ссылки highlights/full; опционально — без него пост без ссылок)
   - publisher (публикация текста)
   - registry (идемпотентность, но отключается в DRY_RUN)
-- Оркестрацию пайплайна: load -> score -> rank -> post -> publish
-- Рендер в текст (без спойлеров, без ссылок на видео)
+- Оркестрацию пайплайна: load -> score -> rank -> [video] -> post -> publish
+- Рендер в текст (без спойлеров; ссылки на видео — только если был video_loader)
 - Мок-адаптеры (smoke test)
 
 DRY_RUN:
@@ -21,13 +22,34 @@ DRY_RUN:
 
 from __future__ import annotations
 
+import heapq
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, List, Optional, Protocol, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
 from zoneinfo import ZoneInfo
 
+from ._scoring_numba import NUMBA_AVAILABLE, score_kernel
 from .contracts import (
+    SEV_ERROR,
+    SRC_TG,
+    VIDEO_FOUND,
+    VIDEO_FULL,
+    VIDEO_HIGHLIGHTS,
+    VIDEO_NOT_FOUND,
     AppError,
+    MatchBatch,
     MatchForScoring,
     MatchScore,
     PlayerGameStats,
@@ -40,6 +62,8 @@ from .contracts import (
     Severity,
     SourceSystem,
     Team,
+    VideoKind,
+    VideoLinkResult,
 )
 
 # -----------------------------
@@ -47,16 +71,20 @@ from .contracts import (
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UsecaseConfig:
     tz_msk: str = "Europe/Moscow"
     publish_hour_msk: int = 8
     lookback_hours: int = 48
     min_interest_score: float = 0.0
+    max_items: Optional[int] = None  # верхняя граница числа матчей в посте (None — без лимита)
 
     # DEV режим: не блокируем повторные запуски, не пишем state
     dry_run: bool = False
 
+    # results и rules грузим параллельно в двух потоках (после проверки идемпотентности)
+    parallel_loaders: bool = True
+
 
 # -----------------------------
 # Ports (adapters interfaces)
@@ -75,6 +103,18 @@ class ScoringRulesLoader(Protocol):
     def load(self) -> Tuple[List[ScoringRule], List[AppError]]: ...
 
 
+class VideoLoader(Protocol):
+    def load_for_matches(
+        self,
+        requests: List[Tuple[int, VideoKind]],
+    ) -> Tuple[List[VideoLinkResult], List[AppError]]:
+        """
+        Все запросы дайджеста одним батчем: адаптер сам группирует их по kind
+        и делает один сетевой вызов на группу, а не по вызову на матч.
+        """
+        ...
+
+
 class Publisher(Protocol):
     def publish(self, text: str) -> Tuple[Optional[str], List[AppError]]: ...
 
@@ -90,29 +130,34 @@ class PublicationRegistry(Protocol):
 # -----------------------------
 
 
+@lru_cache(maxsize=8)
+def _zone(key: str) -> ZoneInfo:
+    return ZoneInfo(key)
+
+
 def compute_window(now_utc: datetime, cfg: UsecaseConfig) -> Tuple[date, datetime, datetime]:
     """
     Окно: последние cfg.lookback_hours часов от 08:00 MSK текущего дня.
     Если запустились раньше 08:00 MSK — используем якорь предыдущего дня.
-    """
-    if now_utc.tzinfo is None:
-        now_utc = now_utc.replace(tzinfo=timezone.utc)
+    now_utc должен быть aware (run_daily_digest нормализует его на входе).
 
-    tz_msk = ZoneInfo(cfg.tz_msk)
-    now_msk = now_utc.astimezone(tz_msk)
+    lookback_hours — абсолютные (UTC) часы: [якорь − N ч, якорь), как в docs/config_v1.md.
+    Раньше вычитались часы по местным часам tz_msk; если между началом окна и якорем
+    был переход на летнее/зимнее время (исторический для Europe/Moscow или любой
+    DST-зоны в cfg.tz_msk), начало окна теперь сдвинуто на величину перехода.
+    """
+    now_msk = now_utc.astimezone(_zone(cfg.tz_msk))
 
     anchor_msk = now_msk.replace(hour=cfg.publish_hour_msk, minute=0, second=0, microsecond=0)
     if now_msk < anchor_msk:
         anchor_msk -= timedelta(days=1)
 
-    run_date_msk = anchor_msk.date()
-    window_end_msk = anchor_msk
-    window_start_msk = anchor_msk - timedelta(hours=cfg.lookback_hours)
-
+    # дальше считаем в UTC: lookback — это абсолютные часы, таймзона уже не нужна
+    anchor_utc = anchor_msk.astimezone(timezone.utc)
     return (
-        run_date_msk,
-        window_start_msk.astimezone(timezone.utc),
-        window_end_msk.astimezone(timezone.utc),
+        anchor_msk.date(),
+        anchor_utc - timedelta(hours=cfg.lookback_hours),
+        anchor_utc,
     )
 
 
@@ -121,8 +166,20 @@ def compute_window(now_utc: datetime, cfg: UsecaseConfig) -> Tuple[date, datetim
 # -----------------------------
 
 
-def _index_rules(rules: List[ScoringRule]) -> Tuple[Dict[str, float], Dict[str, float]]:
-    """Собираем веса по игрокам и командам."""
+@dataclass(frozen=True, slots=True)
+class IndexedRules:
+    """Веса из rules, сведенные по entity_id."""
+
+    player_w: Mapping[str, float]
+    team_w: Mapping[str, float]
+
+
+def _index_rules(rules: List[ScoringRule]) -> IndexedRules:
+    """
+    Собираем веса по игрокам и командам.
+    Без кэша: loader отдает новые ScoringRule на каждый load(), и хэш/сравнение
+    всех правил при попадании в кэш дороже самого прохода (дайджест — раз на процесс).
+    """
     player_w: Dict[str, float] = {}
     team_w: Dict[str, float] = {}
 
@@ -133,13 +190,95 @@ def _index_rules(rules: List[ScoringRule]) -> Tuple[Dict[str, float], Dict[str,
         elif et == "team":
             team_w[r.entity_id] = team_w.get(r.entity_id, 0.0) + float(r.weight)
 
-    return player_w, team_w
+    return IndexedRules(player_w=player_w, team_w=team_w)
+
+
+def _score_kernel_py(
+    home_w: Sequence[float],
+    away_w: Sequence[float],
+    offsets: Sequence[int],
+    row_w: Sequence[float],
+    goals: Sequence[int],
+    assists: Sequence[int],
+    went_ot: Sequence[int],
+    went_so: Sequence[int],
+    score_home: Sequence[int],
+    score_away: Sequence[int],
+) -> Tuple[List[float], List[float], List[float]]:
+    """
+    Числовое ядро скоринга над колонками (без объектов).
+    Строки статов лежат в CSR-виде: строки матча i — это [offsets[i], offsets[i + 1]).
+    Возвращает (scores по матчам, delta по строкам статов, total_goals бонус по матчам).
+    Порядок сложений: команды -> игроки (в порядке строк) -> OT -> SO -> total_goals.
+    """
+    n = len(home_w)
+    scores: List[float] = []
+    row_delta: List[float] = []
+    tg_bonus: List[float] = []
+
+    for i in range(n):
+        score = home_w[i] + away_w[i]
+
+        for j in range(offsets[i], offsets[i + 1]):
+            delta = row_w[j] * (float(goals[j]) + 0.5 * float(assists[j]))
+            row_delta.append(delta)
+            score += delta
+
+        if went_ot[i]:
+            score += 0.2
+        if went_so[i]:
+            score += 0.2
+        tg = min(1.0, (score_home[i] + score_away[i]) / 10.0) * 0.2
+        tg_bonus.append(tg)
+        scores.append(score + tg)
+
+    return scores, row_delta, tg_bonus
+
+
+# numba окупается только на больших батчах: на дайджесте (~15 матчей) конвертация
+# list <-> numpy дороже самого цикла, а первый вызов еще платит за импорт/JIT
+NUMBA_MIN_MATCHES = 500
+
+
+def _score_kernel(
+    home_w: Sequence[float],
+    away_w: Sequence[float],
+    offsets: Sequence[int],
+    row_w: Sequence[float],
+    goals: Sequence[int],
+    assists: Sequence[int],
+    went_ot: Sequence[int],
+    went_so: Sequence[int],
+    score_home: Sequence[int],
+    score_away: Sequence[int],
+) -> Tuple[List[float], List[float], List[float]]:
+    """_score_kernel_py или то же самое скомпилированным циклом (numba, большие батчи)."""
+    if NUMBA_AVAILABLE and len(home_w) >= NUMBA_MIN_MATCHES:
+        out = score_kernel(
+            home_w, away_w, offsets, row_w, goals, assists, went_ot, went_so, score_home, score_away
+        )
+        if out is not None:  # None — find_spec нашел numba, но импорт не удался
+            return out
+    return _score_kernel_py(
+        home_w, away_w, offsets, row_w, goals, assists, went_ot, went_so, score_home, score_away
+    )
+
+
+def _quick_upper_bound(m: MatchForScoring, team_w: Mapping[str, float]) -> float:
+    """
+    Верхняя граница score матча без статов "наших" игроков: веса команд + все бонусы
+    по максимуму (OT, SO, total_goals). Порядок сложений как в ядре, поэтому
+    граница не меньше реального score и с учетом округления.
+    """
+    return team_w.get(m.home.team_id, 0.0) + team_w.get(m.away.team_id, 0.0) + 0.2 + 0.2 + 0.2
 
 
 def score_matches(
     matches: List[MatchForScoring],
     player_stats: List[PlayerGameStats],
     rules: List[ScoringRule],
+    cfg: Optional[UsecaseConfig] = None,
+    with_contributions: bool = False,
 ) -> List[RankedMatch]:
     """
     Черновая формула интересности:
@@ -147,23 +286,83 @@ def score_matches(
     - + вес игрока * (goals + assists*0.5), если есть в rules
     - + бонусы OT/SO
     - + небольшой бонус за total_goals (только внутренняя логика; наружу не выводим)
+
+    Если передан cfg с min_interest_score > 0, матчи, которые заведомо не пройдут
+    порог (_quick_upper_bound ниже порога и нет статов "наших" игроков), в результат
+    не попадают и не считаются. Если задан cfg.max_items — возвращаем только top-K.
+
+    with_contributions=False (по умолчанию): MatchScore.contributions пустой —
+    пайплайну нужен только score; разложение — для отладки/аудита.
     """
-    player_w, team_w = _index_rules(rules)
+    indexed = _index_rules(rules)
+    player_w, team_w = indexed.player_w, indexed.team_w
+
+    if cfg is not None and cfg.min_interest_score > 0:
+        has_star = {ps.match_id for ps in player_stats if ps.player_id in player_w}
+        matches = [
+            m
+            for m in matches
+            if m.match_id in has_star or _quick_upper_bound(m, team_w) >= cfg.min_interest_score
+        ]
+
+    # Кодируем вход в колонки: счет/флаги — из MatchBatch, веса команд — по матчам,
+    # строки статов — только "наших" игроков в известных матчах, с индексом матча.
+    batch = MatchBatch.from_matches(matches)
+    n = len(batch)
+    match_idx = {mid: i for i, mid in enumerate(batch.match_ids)}
+
+    home_w = [team_w.get(m.home.team_id, 0.0) for m in matches]
+    away_w = [team_w.get(m.away.team_id, 0.0) for m in matches]
 
-    stats_by_match: Dict[str, List[PlayerGameStats]] = {}
+    # Строки статов "наших" игроков в известных матчах -> CSR: стабильно сортируем
+    # по индексу матча (порядок строк внутри матча сохраняется) + offsets[n + 1].
+    rows: List[Tuple[int, float, PlayerGameStats]] = []
     for ps in player_stats:
-        stats_by_match.setdefault(ps.match_id, []).append(ps)
+        i = match_idx.get(ps.match_id)
+        w = player_w.get(ps.player_id)
+        if i is None or not w:
+            continue
+        rows.append((i, w, ps))
+    rows.sort(key=itemgetter(0))
+
+    row_match_idx = [i for i, _, _ in rows]
+    offsets = [bisect_left(row_match_idx, i) for i in range(n + 1)]
+
+    scores, row_delta, tg_bonus = _score_kernel(
+        home_w,
+        away_w,
+        offsets,
+        [w for _, w, _ in rows],
+        [ps.goals for _, _, ps in rows],
+        [ps.assists for _, _, ps in rows],
+        batch.went_overtime,
+        batch.went_shootout,
+        batch.score_home,
+        batch.score_away,
+    )
+
+    # сортировка стабильная: при равном score сохраняется исходный порядок матчей;
+    # при лимите cfg.max_items — top-K через кучу, O(N log K) (nlargest дает тот же порядок)
+    if cfg is not None and cfg.max_items is not None:
+        order = heapq.nlargest(cfg.max_items, range(n), key=scores.__getitem__)
+    else:
+        order = sorted(range(n), key=scores.__getitem__, reverse=True)
 
-    ranked: List[RankedMatch] = []
-    for m in matches:
-        score = 0.0
-        contribs: List[ScoreContribution] = []
+    if not with_contributions:
+        return [
+            RankedMatch(
+                match=matches[i], rank=MatchScore(match_id=batch.match_ids[i], score=scores[i])
+            )
+            for i in order
+        ]
 
-        for t in (m.home, m.away):
-            w = team_w.get(t.team_id)
+    # Разложение на вклады (для дебага/аудита) — по результатам ядра, без пересчета
+    contribs: List[List[ScoreContribution]] = []
+    for i, m in enumerate(matches):
+        mc: List[ScoreContribution] = []
+        for t, w in ((m.home, home_w[i]), (m.away, away_w[i])):
             if w:
-                score += w
-                contribs.append(
+                mc.append(
                     ScoreContribution(
                         reason="team_weight",
                         weight=w,
@@ -172,45 +371,34 @@ def score_matches(
                     )
                 )
 
-        for ps in stats_by_match.get(m.match_id, []):
-            w = player_w.get(ps.player_id)
-            if not w:
-                continue
-            factor = float(ps.goals) + 0.5 * float(ps.assists)
-            delta = w * factor
-            if delta:
-                score += delta
-                contribs.append(
+        for j in range(offsets[i], offsets[i + 1]):
+            if row_delta[j]:
+                mc.append(
                     ScoreContribution(
                         reason="player_weight",
-                        weight=delta,
+                        weight=row_delta[j],
                         entity_type="player",
-                        entity_id=ps.player_id,
+                        entity_id=rows[j][2].player_id,
                     )
                 )
 
-        if m.went_overtime:
-            score += 0.2
-            contribs.append(ScoreContribution(reason="overtime_bonus", weight=0.2))
-        if m.went_shootout:
-            score += 0.2
-            contribs.append(ScoreContribution(reason="shootout_bonus", weight=0.2))
-
-        total_goals = int(m.score_home) + int(m.score_away)
-        tg_bonus = min(1.0, total_goals / 10.0) * 0.2
-        if tg_bonus:
-            score += tg_bonus
-            contribs.append(ScoreContribution(reason="total_goals_bonus", weight=tg_bonus))
-
-        ranked.append(
-            RankedMatch(
-                match=m,
-                rank=MatchScore(match_id=m.match_id, score=score, contributions=contribs),
-            )
+        if batch.went_overtime[i]:
+            mc.append(ScoreContribution(reason="overtime_bonus", weight=0.2))
+        if batch.went_shootout[i]:
+            mc.append(ScoreContribution(reason="shootout_bonus", weight=0.2))
+        if tg_bonus[i]:
+            mc.append(ScoreContribution(reason="total_goals_bonus", weight=tg_bonus[i]))
+        contribs.append(mc)
+
+    return [
+        RankedMatch(
+            match=matches[i],
+            rank=MatchScore(
+                match_id=batch.match_ids[i], score=scores[i], contributions=contribs[i]
+            ),
         )
-
-    ranked.sort(key=lambda rm: rm.rank.score, reverse=True)
-    return ranked
+        for i in order
+    ]
 
 
 # -----------------------------
@@ -219,46 +407,72 @@ def score_matches(
 
 
 def _match_title(m: MatchForScoring) -> str:
-    h = m.home.abbr or m.home.name
-    a = m.away.abbr or m.away.name
-    return f"{h} — {a}"
+    return f"{m.home.display} — {m.away.display}"
 
 
-def build_post_public(
-    run_date_msk: date,
-    now_utc: datetime,
+def _build_items(
     ranked: List[RankedMatch],
     cfg: UsecaseConfig,
-    extra_errors: List[AppError],
-) -> PostPublic:
+    video_results: Optional[List[VideoLinkResult]] = None,
+) -> List[PostItemPublic]:
     """
-    MVP без VK:
-    - items: только матч (title) + rank_score (для дебага)
-    - никаких ссылок
+    - items: матч (title) + rank_score (для дебага), только score >= min_interest_score
+    - ссылки highlights/full — только из video_results со статусом FOUND
+      (без video_results пост без ссылок, как в MVP)
     """
     items: List[PostItemPublic] = []
-    errors: List[AppError] = list(extra_errors)
+
+    vmap: Dict[Tuple[int, VideoKind], VideoLinkResult] = {
+        (vr.match_id, vr.kind): vr for vr in video_results or []
+    }
+
+    # enum-члены и порог — в локальные имена: в цикле LOAD_FAST вместо атрибутов класса
+    hi_kind, full_kind, found = VIDEO_HIGHLIGHTS, VIDEO_FULL, VIDEO_FOUND
+    min_score = cfg.min_interest_score
+    vget = vmap.get
+    append = items.append
 
     for rm in ranked:
-        if rm.rank.score < cfg.min_interest_score:
+        score = rm.rank.score
+        if score < min_score:
             continue
 
-        items.append(
+        m = rm.match
+        mid = m.match_id
+        h = vget((mid, hi_kind))
+        f = vget((mid, full_kind))
+
+        append(
             PostItemPublic(
-                match_id=rm.match.match_id,
-                title=_match_title(rm.match),
-                start_time_utc=rm.match.start_time_utc,
-                highlights_url=None,  # не используем в MVP
-                full_url=None,  # не используем в MVP
-                rank_score=rm.rank.score,
+                match_id=mid,
+                title=_match_title(m),
+                start_time_utc=m.start_time_utc,
+                highlights_url=h.url if h and h.status == found else None,
+                full_url=f.url if f and f.status == found else None,
+                rank_score=score,
             )
         )
 
+    return items
+
+
+def build_post_public(
+    run_date_msk: date,
+    now_utc: datetime,
+    ranked: List[RankedMatch],
+    cfg: UsecaseConfig,
+    extra_errors: List[AppError],
+    video_results: Optional[List[VideoLinkResult]] = None,
+) -> PostPublic:
+    """
+    Пост целиком: items (см. _build_items) + extra_errors как есть.
+    now_utc должен быть aware — кладется в generated_at_utc как есть.
+    """
     return PostPublic(
         run_date_msk=run_date_msk,
-        generated_at_utc=now_utc if now_utc.tzinfo else now_utc.replace(tzinfo=timezone.utc),
-        items=items,
-        errors=errors,
+        generated_at_utc=now_utc,
+        items=_build_items(ranked, cfg, video_results),
+        errors=list(extra_errors),
     )
 
 
@@ -267,31 +481,48 @@ def build_post_public(
 # -----------------------------
 
 
-def render_post(post: PostPublic) -> str:
+LINK_NOT_FOUND = "ссылка не найдена"
+
+
+def render_post(post: PostPublic, with_video: bool = False) -> str:
     """
-    MVP без VK: выводим только список матчей.
+    Без видео (MVP): только список матчей.
+    with_video: блок на матч — title + строки highlights/full ("ссылка не найдена", если нет).
+    Дубли ошибок (одинаковый e.dedupe_key) печатаются один раз; в post.errors
+    они остаются — details у них разные (например, match_id).
     """
-    lines: List[str] = []
-
-    if not post.items:
-        lines.append("Матчей нет.")
-    else:
-        for it in post.items:
-            lines.append(it.title)
+    return _render(post.items, post.errors, with_video)
+
+
+def _render(items: List[PostItemPublic], errors: List[AppError], with_video: bool) -> str:
+    """Текст собирается из двух блоков (матчи, проблемы), каждый — одним join."""
+    if items and with_video:
+        head = (
+            "\n\n".join(
+                [
+                    f"{it.title}\n"
+                    f"  highlights: {it.highlights_url or LINK_NOT_FOUND}\n"
+                    f"  full: {it.full_url or LINK_NOT_FOUND}"
+                    for it in items
+                ]
+            )
+            + "\n"
+        )
+    elif items:
         # пустая строка после списка (аккуратно)
-        lines.append("")
+        head = "\n".join([it.title for it in items]) + "\n"
+    else:
+        head = "Матчей нет."
 
-    if post.errors:
-        lines.append("⚠️ Проблемы:")
-        seen = set()
-        for e in post.errors:
-            key = (e.code, e.source.value, e.message)
-            if key in seen:
-                continue
-            seen.add(key)
-            lines.append(f"- [{e.source.value}] {e.code}: {e.message}")
+    if not errors:
+        return head.strip()
 
-    return "\n".join(lines).strip()
+    # dedupe только для текста: dict по dedupe_key сохраняет порядок первого появления
+    uniq: Dict[Tuple[str, str, str], AppError] = {}
+    for e in errors:
+        uniq.setdefault(e.dedupe_key, e)
+    problems = "\n".join([f"- [{e.source.value}] {e.code}: {e.message}" for e in uniq.values()])
+    return f"{head}\n⚠️ Проблемы:\n{problems}".strip()
 
 
 # -----------------------------
@@ -299,6 +530,36 @@ def render_post(post: PostPublic) -> str:
 # -----------------------------
 
 
+def _load_inputs(
+    cfg: UsecaseConfig,
+    results_loader: ResultsLoader,
+    rules_loader: ScoringRulesLoader,
+    window_start_utc: datetime,
+    window_end_utc: datetime,
+) -> Tuple[List[MatchForScoring], List[PlayerGameStats], List[ScoringRule], List[AppError]]:
+    """
+    results + rules. Ошибки в порядке results -> rules; если матчей нет,
+    rules не нужны: их ошибки в пост не попадают.
+    С cfg.parallel_loaders оба загрузчика (I/O, GIL не мешает) идут в потоках,
+    и результат забирается у обоих — исключение rules не теряется.
+    """
+    if cfg.parallel_loaders:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results_f = pool.submit(results_loader.load, window_start_utc, window_end_utc)
+            rules_f = pool.submit(rules_loader.load)
+            matches, player_stats, res_err = results_f.result()
+            rules, rules_err = rules_f.result()
+    else:
+        matches, player_stats, res_err = results_loader.load(window_start_utc, window_end_utc)
+        if not matches:
+            return matches, player_stats, [], res_err
+        rules, rules_err = rules_loader.load()
+
+    if not matches:
+        return matches, player_stats, [], res_err
+    return matches, player_stats, rules, res_err + rules_err
+
+
 def run_daily_digest(
     now_utc: datetime,
     cfg: UsecaseConfig,
@@ -306,7 +567,12 @@ def run_daily_digest(
     rules_loader: ScoringRulesLoader,
     publisher: Publisher,
     registry: PublicationRegistry,
+    video_loader: Optional[VideoLoader] = None,
 ) -> Tuple[Optional[PostPublic], List[AppError]]:
+    # naive now_utc считаем UTC; дальше по пайплайну он везде aware
+    if now_utc.tzinfo is None:
+        now_utc = now_utc.replace(tzinfo=timezone.utc)
+
     errors: List[AppError] = []
 
     run_date_msk, window_start_utc, window_end_utc = compute_window(now_utc, cfg)
@@ -338,70 +604,68 @@ def run_daily_digest(
             )
         )
 
-    # load results
-    matches, player_stats, res_err = results_loader.load(window_start_utc, window_end_utc)
-    errors.extend(res_err)
-
-    # если матчей нет — публикуем "Матчей нет."
-    if not matches:
-        post = PostPublic(
-            run_date_msk=run_date_msk, generated_at_utc=now_utc, items=[], errors=errors
-        )
-        text = render_post(post)
-        msg_id, pub_err = publisher.publish(text)
-        errors.extend(pub_err)
-
-        if (not cfg.dry_run) and msg_id:
-            errors.extend(
-                registry.set_published(
-                    PublicationRecord(
-                        run_date_msk=run_date_msk,
-                        published=True,
-                        tg_message_id=msg_id,
-                        published_at_utc=now_utc
-                        if now_utc.tzinfo
-                        else now_utc.replace(tzinfo=timezone.utc),
-                    )
-                )
-            )
-
-        return post, errors
-
-    # load rules
-    rules, rules_err = rules_loader.load()
-    errors.extend(rules_err)
-
-    # score + rank
-    ranked = score_matches(matches, player_stats, rules)
-
-    # build post (без видео)
-    post = build_post_public(run_date_msk, now_utc, ranked, cfg, extra_errors=errors)
+    # load results + rules (уже после idempotency: опубликованный день ничего не качает)
+    matches, player_stats, rules, load_err = _load_inputs(
+        cfg, results_loader, rules_loader, window_start_utc, window_end_utc
+    )
+    errors.extend(load_err)
 
-    # render & publish
-    text = render_post(post)
+    items: List[PostItemPublic] = []
+    if matches:
+        # score + rank
+        ranked = score_matches(matches, player_stats, rules, cfg)
+
+        # video: один батч (match_id, kind) на все матчи, прошедшие порог
+        video_results: List[VideoLinkResult] = []
+        if video_loader is not None:
+            match_ids = [
+                rm.match.match_id for rm in ranked if rm.rank.score >= cfg.min_interest_score
+            ]
+            if match_ids:
+                reqs = [(mid, VIDEO_HIGHLIGHTS) for mid in match_ids] + [
+                    (mid, VIDEO_FULL) for mid in match_ids
+                ]
+                video_results, video_err = video_loader.load_for_matches(reqs)
+                errors.extend(video_err)
+                errors.extend(vr.error for vr in video_results if vr.error is not None)
+
+        items = _build_items(ranked, cfg, video_results)
+    # иначе матчей нет — публикуем "Матчей нет."
+
+    # render & publish: в тексте — ошибки, известные до публикации
+    text = _render(items, errors, with_video=video_loader is not None)
     msg_id, pub_err = publisher.publish(text)
     errors.extend(pub_err)
 
-    # record publication (только PROD)
-    if (not cfg.dry_run) and msg_id:
+    if not msg_id:
+        # без message_id публикация не подтверждена: state не пишем, следующий
+        # запуск за эту дату не будет заблокирован идемпотентностью
+        errors.append(
+            AppError(
+                code="PUBLISH_FAILED",
+                source=SRC_TG,
+                severity=SEV_ERROR,
+                message=f"Пост за {run_date_msk} не опубликован: publisher не вернул message_id.",
+            )
+        )
+    elif not cfg.dry_run:
+        # record publication (только PROD и только после подтвержденной публикации)
         errors.extend(
             registry.set_published(
                 PublicationRecord(
                     run_date_msk=run_date_msk,
                     published=True,
                     tg_message_id=msg_id,
-                    published_at_utc=now_utc
-                    if now_utc.tzinfo
-                    else now_utc.replace(tzinfo=timezone.utc),
+                    published_at_utc=now_utc,
                 )
             )
         )
 
-    # финализируем ошибки в post
+    # PostPublic собираем один раз, когда известны все ошибки (включая publish/state)
     post = PostPublic(
-        run_date_msk=post.run_date_msk,
-        generated_at_utc=post.generated_at_utc,
-        items=post.items,
+        run_date_msk=run_date_msk,
+        generated_at_utc=now_utc,
+        items=items,
         errors=errors,
     )
     return post, errors
@@ -467,6 +731,30 @@ class MockScoringRulesLoader:
         return rules, []
 
 
+class MockVideoLoader:
+    def load_for_matches(self, requests: List[Tuple[int, VideoKind]]):
+        # как реальный адаптер: группируем по kind -> один "вызов" на группу
+        by_kind: Dict[VideoKind, List[int]] = {}
+        for mid, kind in requests:
+            by_kind.setdefault(kind, []).append(mid)
+
+        results: List[VideoLinkResult] = []
+        for kind, mids in by_kind.items():
+            for mid in mids:
+                if kind == VIDEO_HIGHLIGHTS:
+                    results.append(
+                        VideoLinkResult(
+                            match_id=mid,
+                            kind=kind,
+                            status=VIDEO_FOUND,
+                            url=f"https://vk.com/video?q={mid}_{kind.value}",
+                        )
+                    )
+                else:
+                    results.append(VideoLinkResult(match_id=mid, kind=kind, status=VIDEO_NOT_FOUND))
+        return results, []
+
+
 class StdoutPublisher:
     def publish(self, text: str):
         print("----- PUBLISH -----")
@@ -483,6 +771,36 @@ class NoopRegistry:
         return []
 
 
+class InMemoryPublicationRegistry:
+    """
+    Registry в памяти (нагрузочные/интеграционные прогоны без файлов).
+    get/set_published — O(1) по dict; для выборок по диапазону дат держим
+    отсортированный список ключей, пересобираемый лениво после записи.
+    """
+
+    def __init__(self) -> None:
+        self._store: Dict[date, PublicationRecord] = {}
+        self._keys: Optional[List[date]] = None  # None = нужно пересортировать
+
+    def get(self, run_date_msk: date):
+        return self._store.get(run_date_msk), []
+
+    def set_published(self, record: PublicationRecord):
+        if record.run_date_msk not in self._store:
+            self._keys = None
+        self._store[record.run_date_msk] = record
+        return []
+
+    def published_between(self, start: date, end: date) -> List[PublicationRecord]:
+        """Записи с start <= run_date_msk <= end, по возрастанию даты."""
+        if self._keys is None:
+            self._keys = sorted(self._store)
+        keys = self._keys
+        lo = bisect_left(keys, start)
+        hi = bisect_right(keys, end, lo)
+        return [self._store[k] for k in keys[lo:hi]]
+
+
 if __name__ == "__main__":
     cfg = UsecaseConfig(min_interest_score=0.0, dry_run=True)  # DEV
     now_utc = datetime.now(timezone.utc)
@@ -494,6 +812,7 @@ if __name__ == "__main__":
         rules_loader=MockScoringRulesLoader(),
         publisher=StdoutPublisher(),
         registry=NoopRegistry(),
+        video_loader=MockVideoLoader(),
     )
 
     print("errors:", errs)